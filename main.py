@@ -1,9 +1,10 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 import crypto_utils as cu
-import technical_indicators as ti
+import ti_fast
 
 # Page configuration
 st.set_page_config(
@@ -12,24 +13,133 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def load_css():
+    """Read the custom stylesheet once per process"""
+    with open('styles.css') as f:
+        return f.read()
+
 # Custom CSS
-with open('styles.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+st.markdown(f'<style>{load_css()}</style>', unsafe_allow_html=True)
 
 def format_coin_name(coin_id):
     """Format coin ID to a more readable name"""
     return coin_id.replace('-', ' ').title()
 
-def plot_with_indicators(df, indicators):
-    fig = go.Figure()
+# Data fetched from CoinGecko is cached so widget-triggered reruns don't hit the API again
+CACHE_TTL = 60
+
+@st.cache_resource
+def cache_fill_times():
+    """When each loader last ran its body, i.e. last filled its cache entry"""
+    # Held in cache_resource because module globals are reset on every rerun
+    return {}
+
+def _is_cached(key):
+    """Whether the loader entry for `key` was filled within the cache TTL"""
+    filled = cache_fill_times().get(key)
+    return filled is not None and time.monotonic() - filled < CACHE_TTL
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_historical_data(coin_id, timeframe, _prefetched=None):
+    """Fetch OHLC history for a coin, cached per (coin, timeframe)"""
+    # A failed prefetch is retried here so crypto_utils reports the error in place
+    df = _prefetched if _prefetched is not None else cu.get_historical_data(coin_id, timeframe)
+    cache_fill_times()[('historical', coin_id, timeframe)] = time.monotonic()
+    if df is not None:
+        # float32 is plenty for display and halves the indicator math and chart payload
+        for col in ('open', 'high', 'low', 'close'):
+            df[col] = df[col].astype(np.float32)
+    return df
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_market_data(coin_id, _prefetched=None):
+    """Fetch current market data for a coin, cached per coin"""
+    market_data = _prefetched if _prefetched is not None else cu.get_market_data(coin_id)
+    cache_fill_times()[('market', coin_id)] = time.monotonic()
+    return market_data
+
+def _fetch_quietly(func, *args):
+    """Call a crypto_utils fetcher on a worker thread, returning None on failure"""
+    try:
+        return func(*args)
+    except Exception:
+        return None
+
+def prefetch_coin_data(coin_id, timeframe):
+    """Fetch OHLC history and market data concurrently when neither is cached yet"""
+    # Both calls are independent HTTP requests, so wall time is the slower of the
+    # two. The workers have no script context, so anything crypto_utils would show
+    # there is dropped; the loaders, called from the main thread inside their
+    # column, retry a failed fetch so its error and the spinner land in place.
+    if _is_cached(('historical', coin_id, timeframe)) or _is_cached(('market', coin_id)):
+        # With at most one fetch left a pool gains nothing; the loader handles it
+        return {}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        historical = pool.submit(_fetch_quietly, cu.get_historical_data, coin_id, timeframe)
+        market = pool.submit(_fetch_quietly, cu.get_market_data, coin_id)
+        return {'historical': historical.result(), 'market': market.result()}
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_comparison_data(coin_ids):
+    """Fetch normalized comparison data, cached per list of coins"""
+    return cu.get_comparison_data(coin_ids)
+
+def compute_indicators(df, indicators):
+    """Compute each indicator once so the charts and the summary can share results"""
+    ind = set(indicators)
+    # Convert once; the NumPy indicators work on the raw float array, not the Series
+    close_np = df['close'].to_numpy(copy=False)
+    precomputed = {
+        # Always needed by the Technical Analysis Summary, which only reads
+        # the latest MA values
+        'ma20_last': ti_fast.last_sma(close_np, 20),
+        'ma50_last': ti_fast.last_sma(close_np, 50),
+        'sr': ti_fast.identify_support_resistance(df),
+    }
+    if 'MACD' in ind:
+        # RSI is always needed, so MACD rides along in the same pass over the prices
+        precomputed['rsi'], precomputed['macd'] = ti_fast.calculate_rsi_macd(close_np)
+    else:
+        precomputed['rsi'] = ti_fast.calculate_rsi(close_np)
+    if 'MA' in ind:
+        precomputed['ma20'] = ti_fast.fast_sma(close_np, 20)
+        precomputed['ma50'] = ti_fast.fast_sma(close_np, 50)
+    if 'EMA' in ind:
+        precomputed['ema20'] = ti_fast.calculate_ema(close_np, 20)
+    if 'Bollinger Bands' in ind:
+        precomputed['bb'] = ti_fast.calculate_bollinger_bands(close_np)
+    return precomputed
+
+# Above this many rows the candlestick trace is resampled to CANDLE_TARGET candles
+MAX_CANDLES = 2000
+CANDLE_TARGET = 1500
+
+def downsample_ohlc(x, o, h, l, c, n_candles):
+    """Merge consecutive candles into `n_candles` OHLC buckets, keeping every wick"""
+    starts = np.linspace(0, len(x), n_candles, endpoint=False).astype(np.intp)
+    ends = np.append(starts[1:], len(x)) - 1
+    return (x[starts], o[starts], np.maximum.reduceat(h, starts),
+            np.minimum.reduceat(l, starts), c[ends])
+
+def plot_with_indicators(df, indicators, precomputed):
+    ind = set(indicators)
+    idx = df.index
+    # Raw arrays let Plotly encode the candles without going through Series. x stays
+    # the index the overlays use, so a tz-aware index lines up across all traces
+    x = idx
+    o, h, l, c = (df[col].to_numpy(copy=False) for col in ('open', 'high', 'low', 'close'))
+    # Long histories would serialize thousands of candles; overlays stay full resolution
+    if len(df) > MAX_CANDLES:
+        x, o, h, l, c = downsample_ohlc(x, o, h, l, c, CANDLE_TARGET)
 
     # Candlestick chart with hover info
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
+    traces = [go.Candlestick(
+        x=x,
+        open=o,
+        high=h,
+        low=l,
+        close=c,
         name="Price",
         hoverinfo="all",
         hoverlabel=dict(
@@ -37,74 +147,82 @@ def plot_with_indicators(df, indicators):
             font_size=16,
             font_family="Roboto"
         )
-    ))
+    )]
 
     # Add technical indicators based on selection
-    if 'MA' in indicators:
-        ma20 = ti.calculate_ma(df['close'], 20)
-        ma50 = ti.calculate_ma(df['close'], 50)
-        fig.add_trace(go.Scatter(
-            x=df.index, 
+    if 'MA' in ind:
+        ma20 = precomputed['ma20']
+        ma50 = precomputed['ma50']
+        traces.append(go.Scattergl(
+            x=idx, 
             y=ma20, 
             name="MA20", 
             line=dict(color='orange'),
             hovertemplate="MA20: $%{y:,.2f}<extra></extra>"
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, 
+        traces.append(go.Scattergl(
+            x=idx, 
             y=ma50, 
             name="MA50", 
             line=dict(color='blue'),
             hovertemplate="MA50: $%{y:,.2f}<extra></extra>"
         ))
 
-    if 'EMA' in indicators:
-        ema20 = ti.calculate_ema(df['close'], 20)
-        fig.add_trace(go.Scatter(
-            x=df.index, 
+    if 'EMA' in ind:
+        ema20 = precomputed['ema20']
+        traces.append(go.Scattergl(
+            x=idx, 
             y=ema20, 
             name="EMA20", 
             line=dict(color='purple'),
             hovertemplate="EMA20: $%{y:,.2f}<extra></extra>"
         ))
 
-    if 'Bollinger Bands' in indicators:
-        upper, middle, lower = ti.calculate_bollinger_bands(df['close'])
-        fig.add_trace(go.Scatter(
-            x=df.index, 
+    if 'Bollinger Bands' in ind:
+        upper, middle, lower = precomputed['bb']
+        traces.append(go.Scattergl(
+            x=idx, 
             y=upper, 
             name="Upper BB", 
             line=dict(color='gray', dash='dash'),
             hovertemplate="Upper BB: $%{y:,.2f}<extra></extra>"
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, 
+        traces.append(go.Scattergl(
+            x=idx, 
             y=lower, 
             name="Lower BB", 
             line=dict(color='gray', dash='dash'),
             hovertemplate="Lower BB: $%{y:,.2f}<extra></extra>"
         ))
 
-    if 'Support/Resistance' in indicators:
-        support, resistance = ti.identify_support_resistance(df)
-        for level in support[:3]:  # Show top 3 levels
-            fig.add_hline(
-                y=level, 
-                line_color="green", 
-                line_dash="dash", 
-                opacity=0.5,
-                annotation_text=f"Support: ${level:,.2f}"
-            )
-        for level in resistance[:3]:
-            fig.add_hline(
-                y=level, 
-                line_color="red", 
-                line_dash="dash", 
+    if 'Support/Resistance' in ind:
+        support, resistance = precomputed['sr']
+        # One trace per side: None-separated segments across the chart instead
+        # of a shape + annotation per level
+        for label, levels, color in (("Support", support, "green"),
+                                     ("Resistance", resistance, "red")):
+            xs, ys, texts, labels = [], [], [], []
+            for level in levels[:3]:  # Show top 3 levels
+                level_text = f"{label}: ${level:,.2f}"
+                xs += [idx[0], idx[-1], None]
+                ys += [level, level, None]
+                texts += [level_text, level_text, None]
+                labels += [None, level_text, None]
+            traces.append(go.Scattergl(
+                x=xs,
+                y=ys,
+                mode="lines+text",
+                line=dict(color=color, dash="dash"),
                 opacity=0.5,
-                annotation_text=f"Resistance: ${level:,.2f}"
-            )
+                text=labels,
+                textposition="top left",
+                hovertext=texts,
+                hoverinfo="text",
+                showlegend=False
+            ))
 
-    fig.update_layout(
+    # Build the figure in one pass instead of validating each trace separately
+    fig = go.Figure(data=traces, layout=dict(
         title="Price Analysis with Technical Indicators",
         yaxis_title="Price (USD)",
         template="plotly_dark",
@@ -130,10 +248,69 @@ def plot_with_indicators(df, indicators):
             gridcolor='rgba(128, 128, 128, 0.2)',
             tickformat='$,.2f'
         )
-    )
+    ))
 
     return fig
 
+def plot_rsi(df, rsi):
+    fig_rsi = go.Figure(
+        data=[go.Scattergl(x=df.index, y=rsi, name="RSI")],
+        layout=dict(title="RSI Indicator", height=200, template="plotly_dark")
+    )
+    fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
+    fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
+    return fig_rsi
+
+def plot_macd(df, macd, signal, hist):
+    fig_macd = go.Figure(
+        data=[
+            go.Scattergl(x=df.index, y=macd, name="MACD"),
+            go.Scattergl(x=df.index, y=signal, name="Signal"),
+            go.Bar(x=df.index, y=hist, name="Histogram"),
+        ],
+        layout=dict(title="MACD Indicator", height=200, template="plotly_dark")
+    )
+    return fig_macd
+
+def plot_comparison(comparison_data):
+    # One contiguous 2-D array; each trace takes a column view of it
+    idx = comparison_data.index
+    pct = comparison_data.to_numpy(dtype=np.float32)
+    traces = [
+        go.Scattergl(
+            x=idx,
+            y=pct[:, j],
+            name=format_coin_name(coin)
+        )
+        for j, coin in enumerate(comparison_data.columns)
+    ]
+    fig_comp = go.Figure(data=traces, layout=dict(
+        title="30-Day Price Comparison (Normalized)",
+        yaxis_title="Price Change (%)",
+        height=300,
+        template="plotly_dark"
+    ))
+    return fig_comp
+
+def data_fingerprint(df, columns=None):
+    """Identify a fetched frame by its length and last row, for use in figure cache keys"""
+    # Only the plotted columns are read, so extra text columns from crypto_utils are ignored
+    if columns is not None:
+        df = df[list(columns)]
+    if df.empty:
+        return (0,)
+    return (len(df), str(df.index[-1])) + tuple(float(v) for v in df.iloc[-1])
+
+# Keys multiply across coins, timeframes, fetches and indicator subsets; keep the
+# most recent figures only
+@st.cache_resource(ttl=CACHE_TTL, max_entries=100)
+def build_figure(chart, key, _plot):
+    """Build a figure once per (chart, key); `key` must identify everything `_plot` draws"""
+    # The leading underscore keeps Streamlit from hashing the closure (and the
+    # DataFrame inside it). cache_resource hands back the same Figure instead of
+    # unpickling a copy; st.plotly_chart only reads it.
+    return _plot()
+
 def main():
     st.title("Advanced Cryptocurrency Analysis")
 
@@ -166,37 +343,39 @@ def main():
     # Main content
     col1, col2 = st.columns([2, 1])
 
+    # Fetch data for both columns concurrently; each column then reads its own cache
+    prefetched = prefetch_coin_data(selected_crypto, timeframe)
+
     with col1:
         # Get and display data
-        df = cu.get_historical_data(selected_crypto, timeframe)
+        df = load_historical_data(selected_crypto, timeframe, _prefetched=prefetched.get('historical'))
         if df is not None:
+            ind = set(indicators)
+            precomputed = compute_indicators(df, indicators)
+            # The fingerprint ties cached figures to this fetch, since the figure
+            # cache and the data cache expire on separate clocks
+            data_key = (selected_crypto, timeframe, data_fingerprint(df, ('open', 'high', 'low', 'close')))
+
             # Main price chart with selected indicators
-            fig = plot_with_indicators(df, indicators)
+            fig = build_figure(
+                "price", data_key + (tuple(sorted(ind)),),
+                lambda: plot_with_indicators(df, indicators, precomputed)
+            )
             st.plotly_chart(fig, use_container_width=True)
 
             # Additional indicators in separate charts
-            if "RSI" in indicators:
-                rsi = ti.calculate_rsi(df['close'])
-                fig_rsi = go.Figure()
-                fig_rsi.add_trace(go.Scatter(x=df.index, y=rsi, name="RSI"))
-                fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-                fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-                fig_rsi.update_layout(title="RSI Indicator", height=200, template="plotly_dark")
+            if "RSI" in ind:
+                fig_rsi = build_figure("rsi", data_key, lambda: plot_rsi(df, precomputed['rsi']))
                 st.plotly_chart(fig_rsi, use_container_width=True)
 
-            if "MACD" in indicators:
-                macd, signal, hist = ti.calculate_macd(df['close'])
-                fig_macd = go.Figure()
-                fig_macd.add_trace(go.Scatter(x=df.index, y=macd, name="MACD"))
-                fig_macd.add_trace(go.Scatter(x=df.index, y=signal, name="Signal"))
-                fig_macd.add_trace(go.Bar(x=df.index, y=hist, name="Histogram"))
-                fig_macd.update_layout(title="MACD Indicator", height=200, template="plotly_dark")
+            if "MACD" in ind:
+                fig_macd = build_figure("macd", data_key, lambda: plot_macd(df, *precomputed['macd']))
                 st.plotly_chart(fig_macd, use_container_width=True)
 
     with col2:
         # Market Analysis
         st.subheader("Market Analysis")
-        market_data = cu.get_market_data(selected_crypto)
+        market_data = load_market_data(selected_crypto, _prefetched=prefetched.get('market'))
         if market_data:
             # Current price and 24h change
             col_price, col_change = st.columns(2)
@@ -226,10 +405,9 @@ def main():
         # Technical Analysis Summary
         st.subheader("Technical Analysis Summary")
         if df is not None:
-            latest_close = df['close'].iloc[-1]
-            ma20 = ti.calculate_ma(df['close'], 20).iloc[-1]
-            ma50 = ti.calculate_ma(df['close'], 50).iloc[-1]
-            rsi = ti.calculate_rsi(df['close']).iloc[-1]
+            ma20 = precomputed['ma20_last']
+            ma50 = precomputed['ma50_last']
+            rsi = precomputed['rsi'][-1]
 
             # Trend Analysis
             trend = "Bullish" if ma20 > ma50 else "Bearish"
@@ -240,10 +418,12 @@ def main():
             st.write(f"RSI Signal: {rsi_signal}")
 
             # Support/Resistance
-            support, resistance = ti.identify_support_resistance(df)
+            support, resistance = precomputed['sr']
             st.write("Key Levels:")
-            st.write(f"Support: ${support[0]:,.2f}")
-            st.write(f"Resistance: ${resistance[0]:,.2f}")
+            if len(support):
+                st.write(f"Support: ${support[0]:,.2f}")
+            if len(resistance):
+                st.write(f"Resistance: ${resistance[0]:,.2f}")
 
         # Meme Coins Comparison
         st.subheader("Compare with Meme Coins")
@@ -255,20 +435,12 @@ def main():
         )
 
         if compare_with:
-            comparison_data = cu.get_comparison_data([selected_crypto] + compare_with)
+            coin_ids = [selected_crypto] + compare_with
+            comparison_data = load_comparison_data(coin_ids)
             if comparison_data is not None:
-                fig_comp = go.Figure()
-                for coin in comparison_data.columns:
-                    fig_comp.add_trace(go.Scatter(
-                        x=comparison_data.index,
-                        y=comparison_data[coin],
-                        name=format_coin_name(coin)
-                    ))
-                fig_comp.update_layout(
-                    title="30-Day Price Comparison (Normalized)",
-                    yaxis_title="Price Change (%)",
-                    height=300,
-                    template="plotly_dark"
+                fig_comp = build_figure(
+                    "comparison", (tuple(coin_ids), data_fingerprint(comparison_data)),
+                    lambda: plot_comparison(comparison_data)
                 )
                 st.plotly_chart(fig_comp, use_container_width=True)
 
@@ -0,0 +1,161 @@
+import numpy as np
+from numba import njit
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+# NumPy-backed counterparts of the technical_indicators functions used by main.py.
+# They take a plain float ndarray (e.g. df['close'].to_numpy()) and return ndarrays
+# aligned with the input, padded with NaN where the window isn't full yet. Sums are
+# accumulated in float64 but results keep the input dtype, so float32 prices stay
+# float32 end to end.
+
+def _pad(values, n, dtype):
+    """Left-pad a windowed result with NaN so it lines up with the input"""
+    out = np.full(n, np.nan, dtype=dtype)
+    out[n - len(values):] = values
+    return out
+
+def _ema(close, span):
+    """Exponential moving average seeded with the first sample (pandas adjust=False)"""
+    dtype = close.dtype
+    close = np.asarray(close, dtype=np.float64)
+    if len(close) == 0:
+        return close.astype(dtype)
+    # y[i] = alpha * x[i] + (1 - alpha) * y[i-1] is a first-order IIR filter;
+    # the initial state makes y[0] == x[0]
+    alpha = 2 / (span + 1)
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], close, zi=[(1 - alpha) * close[0]])
+    return out.astype(dtype, copy=False)
+
+def _rolling_sum(values, window):
+    """Sum of each full `window`, one add and one subtract per step via a prefix sum"""
+    csum = np.empty(len(values) + 1)
+    csum[0] = 0
+    np.cumsum(values, out=csum[1:])
+    return csum[window:] - csum[:-window]
+
+def fast_sma(close, window):
+    """Simple moving average over `window` samples"""
+    if len(close) < window:
+        return np.full(len(close), np.nan, dtype=close.dtype)
+    return _pad(_rolling_sum(close, window) / window, len(close), close.dtype)
+
+def last_sma(close, window):
+    """Latest value of the simple moving average, without computing the full series"""
+    if len(close) < window:
+        return np.nan
+    return close[-window:].mean(dtype=np.float64)
+
+def calculate_ema(close, window):
+    """Exponential moving average, NaN until `window` samples are available"""
+    ema = _ema(close, window)
+    ema[:window - 1] = np.nan
+    return ema
+
+@njit(cache=True)
+def _bb_nb(close, window, num_std):
+    """Single-pass rolling mean/std kernel behind calculate_bollinger_bands"""
+    n = len(close)
+    upper = np.full_like(close, np.nan)
+    middle = np.full_like(close, np.nan)
+    lower = np.full_like(close, np.nan)
+    # Variance is shift-invariant; centring on the first price keeps the
+    # sum-of-squares cancellation small
+    base = np.float64(close[0]) if n > 0 else 0.0
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n):
+        v = close[i] - base
+        total += v
+        total_sq += v * v
+        if i >= window:
+            old = close[i - window] - base
+            total -= old
+            total_sq -= old * old
+        if i >= window - 1:
+            var = (total_sq - total * total / window) / (window - 1)
+            std = np.sqrt(var) if var > 0 else 0.0
+            mean = total / window + base
+            middle[i] = mean
+            upper[i] = mean + num_std * std
+            lower[i] = mean - num_std * std
+    return upper, middle, lower
+
+def calculate_bollinger_bands(close, window=20, num_std=2):
+    """Upper, middle and lower Bollinger Bands"""
+    return _bb_nb(close, window, float(num_std))
+
+@njit(cache=True)
+def _rsi_macd_nb(close, period, fast, slow, signal, with_macd):
+    """Wilder RSI and, optionally, MACD from a single pass over `close`"""
+    n = len(close)
+    rsi = np.full_like(close, np.nan)
+    # RSI-only calls get empty MACD outputs instead of three throwaway arrays
+    macd_n = n if with_macd else 0
+    macd = np.full_like(close[:macd_n], np.nan)
+    signal_line = np.full_like(close[:macd_n], np.nan)
+    hist = np.full_like(close[:macd_n], np.nan)
+    if n == 0:
+        return rsi, macd, signal_line, hist
+    alpha_fast = 2 / (fast + 1)
+    alpha_slow = 2 / (slow + 1)
+    alpha_signal = 2 / (signal + 1)
+    # EMAs are seeded with the first sample, like pandas ewm(adjust=False)
+    ema_fast = np.float64(close[0])
+    ema_slow = ema_fast
+    ema_signal = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(n):
+        x = np.float64(close[i])
+        if with_macd:
+            ema_fast += alpha_fast * (x - ema_fast)
+            ema_slow += alpha_slow * (x - ema_slow)
+            m = ema_fast - ema_slow
+            ema_signal += alpha_signal * (m - ema_signal)
+            macd[i] = m
+            signal_line[i] = ema_signal
+            hist[i] = m - ema_signal
+        if i == 0 or n <= period:
+            continue
+        delta = x - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i <= period:
+            # Seed with the plain average of the first `period` changes
+            avg_gain += gain / period
+            avg_loss += loss / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if i >= period:
+            rsi[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return rsi, macd, signal_line, hist
+
+def calculate_rsi(close, period=14):
+    """Relative Strength Index using Wilder's smoothing"""
+    return _rsi_macd_nb(close, period, 12, 26, 9, False)[0]
+
+def calculate_rsi_macd(close, period=14, fast=12, slow=26, signal=9):
+    """RSI plus (MACD, signal, histogram), fused into one pass over the prices"""
+    rsi, macd, signal_line, hist = _rsi_macd_nb(close, period, fast, slow, signal, True)
+    return rsi, (macd, signal_line, hist)
+
+def identify_support_resistance(df, window=5):
+    """Support and resistance levels from local lows/highs across `window` bars each side"""
+    high = df['high'].to_numpy(copy=False)
+    low = df['low'].to_numpy(copy=False)
+    size = 2 * window + 1
+    if len(high) < size:
+        return np.array([]), np.array([])
+    # A bar is a peak/trough if it is the extreme of the window centred on it
+    centre = slice(window, len(high) - window)
+    peaks = high[centre] == sliding_window_view(high, size).max(axis=-1)
+    troughs = low[centre] == sliding_window_view(low, size).min(axis=-1)
+    # Round to 4 significant figures of the typical price so nearby levels merge
+    # for coins trading at $60k and at $0.00001 alike
+    scale = np.nanmedian(high)
+    decimals = 3 - int(np.floor(np.log10(scale))) if scale > 0 else 2
+    resistance = np.unique(np.round(high[centre][peaks], decimals))[::-1]
+    support = np.unique(np.round(low[centre][troughs], decimals))
+    return support, resistance